@@ -1,6 +1,16 @@
 from django.apps import AppConfig
+from django.conf import settings
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
 
 
 class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api'
+
+    def ready(self) -> None:
+        # Register the shopping list font once per process instead of
+        # re-parsing the TTF file on every PDF render
+        pdfmetrics.registerFont(
+            TTFont('Georgia', settings.BASE_DIR / 'fonts' / 'georgia.ttf')
+        )
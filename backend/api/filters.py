@@ -1,4 +1,6 @@
 from django.contrib.auth import get_user_model
+from django.db.models import Exists, OuterRef
+from django.db.models.query import QuerySet
 from django_filters import rest_framework as filters
 
 from recipes.models import Ingredient, Recipe, Tag
@@ -13,6 +15,7 @@ class RecipeFilter(filters.FilterSet):
         field_name='tags__slug',
         queryset=Tag.objects.all(),
         to_field_name='slug',
+        method='filter_tags',
     )
     is_favorited = filters.BooleanFilter(field_name='is_favorited')
     is_in_shopping_cart = filters.BooleanFilter(
@@ -23,6 +26,19 @@ class RecipeFilter(filters.FilterSet):
         model = Recipe
         fields = ('tags', 'author', 'is_favorited', 'is_in_shopping_cart')
 
+    def filter_tags(self, queryset: QuerySet, name: str, value) -> QuerySet:
+        # A semi-join does not duplicate recipes with several matching
+        # tags, so no DISTINCT pass is needed
+        if not value:
+            return queryset
+        return queryset.filter(
+            Exists(
+                Recipe.tags.through.objects.filter(
+                    recipe=OuterRef('pk'), tag__in=value
+                )
+            )
+        )
+
 
 class IngredientFilter(filters.FilterSet):
     """Filter for Ingredient model based on name"""
@@ -1,24 +1,37 @@
-import io
+import tempfile
 
-from django.db.models import F, Sum
+from django.db.models import Sum
 from django.http import FileResponse
 from reportlab.lib.pagesizes import A4
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
 from reportlab.pdfgen import canvas
 from rest_framework.request import Request
+from rest_framework.response import Response
 
-from recipes.models import IngredientRecipe
+from recipes.models import IngredientRecipe, Recipe
+
+# Documents up to this size are kept in memory, larger ones spill to disk
+PDF_SPOOL_MAX_SIZE = 64 * 1024
+
+
+class ValuesListMixin:
+    """
+    Build list responses of read-only viewsets from flat values() rows
+    instead of going through the serializer.
+    """
+
+    list_fields: tuple[str, ...]
+
+    def list(self, request: Request, *args, **kwargs) -> Response:
+        queryset = self.filter_queryset(self.get_queryset())
+        return Response(list(queryset.values(*self.list_fields)))
 
 
 class ShoppingListGeneratorMixin:
     def generate_shopping_list(self, request: Request) -> FileResponse:
-        buffer = io.BytesIO()
+        buffer = tempfile.SpooledTemporaryFile(max_size=PDF_SPOOL_MAX_SIZE)
 
         c = canvas.Canvas(buffer, pagesize=A4)
 
-        pdfmetrics.registerFont(TTFont('Georgia', 'fonts/georgia.ttf'))
-
         c.setFont('Georgia', 14)
 
         # Add some title and separator in the PDF
@@ -30,15 +43,14 @@ class ShoppingListGeneratorMixin:
         )
         c.drawString(100, 730, '-' * 50)
 
-        # Get the shopping cart text with ingredients and recipes
-        text = self._get_shopping_cart_text(request.user)
+        # Get the shopping cart lines with ingredients and recipes
+        lines = self._get_shopping_cart_lines(request.user)
 
-        # Start from the Y-coordinate 710 and decrease it for each line of text
-        lines = text.split('\n')
-        y_position = 710
-        for line in lines:
-            c.drawString(100, y_position, line)
-            y_position -= 14  # Adjust line height (12 pt font + some margin)
+        # Draw all lines as a single text object starting from Y-coordinate 710
+        text_object = c.beginText(100, 710)
+        text_object.setFont('Georgia', 14, leading=14)
+        text_object.textLines(lines)
+        c.drawText(text_object)
 
         c.save()
 
@@ -49,38 +61,38 @@ class ShoppingListGeneratorMixin:
             filename=f'shopping_cart_{request.user.username}.pdf',
         )
 
-    def _get_shopping_cart_text(self, user) -> str:
-        # Query ingredients and their total amounts
-        # for the user's shopping cart
-        ingredient_amount_queryset = (
+    def _get_shopping_cart_lines(self, user) -> list[str]:
+        # Recipe headers come from the cart itself, the ingredient
+        # totals are summed by the database
+        recipes = (
+            Recipe.objects.filter(shopping_cart__user=user)
+            .values('name', 'cooking_time')
+            .order_by('name')
+        )
+        ingredient_totals = (
             IngredientRecipe.objects.filter(recipe__shopping_cart__user=user)
-            .values('ingredient__name')
-            .annotate(total_amount=Sum(F('amount')))
-            .order_by('ingredient__name')
+            .values('ingredient__name', 'ingredient__measurement_unit')
+            .annotate(total_amount=Sum('amount'))
+            .order_by('ingredient__name', 'ingredient__measurement_unit')
         )
 
-        shopping_cart = []
-
-        # Iterate over recipes in the user's shopping cart
-        for recipe in user.shopping_cart.values(
-            'recipe__name', 'recipe__cooking_time'
-        ):
-            recipe_name = recipe['recipe__name']
-            cooking_time = recipe['recipe__cooking_time']
-            recipe_info = ' | '.join(
+        shopping_cart = [
+            ' | '.join(
                 (
-                    f'Рецепт: {recipe_name}',
-                    f'Время приготовления: {cooking_time} мин',
+                    f'Рецепт: {recipe["name"]}',
+                    f'Время приготовления: {recipe["cooking_time"]} мин',
                 )
             )
-            shopping_cart.append(recipe_info)
+            for recipe in recipes
+        ]
 
-        shopping_cart.append('\nИнгредиенты:\n')
+        shopping_cart.extend(('', 'Ингредиенты:', ''))
 
-        # Iterate over ingredient queryset and format output
-        for ingredient_entry in ingredient_amount_queryset:
-            ingredient = ingredient_entry['ingredient__name']
-            total_amount = ingredient_entry['total_amount']
-            shopping_cart.append(f'{ingredient}: {total_amount}')
+        for row in ingredient_totals:
+            shopping_cart.append(
+                f'{row["ingredient__name"]} '
+                f'({row["ingredient__measurement_unit"]}): '
+                f'{row["total_amount"]}'
+            )
 
-        return '\n'.join(shopping_cart)
+        return shopping_cart
@@ -1,14 +1,29 @@
+from functools import cached_property
+from typing import Optional
+
 from django.contrib.auth import get_user_model
+from django.db import IntegrityError
+from django.db.models import Prefetch
+from django.db.models.query import QuerySet
 from django.db.transaction import atomic
 from django.utils.translation import gettext_lazy as _
-from drf_extra_fields.fields import Base64ImageField
-from rest_framework import serializers, validators
+from rest_framework import serializers
+from rest_framework.settings import api_settings
 
+from .fields import Base64ImageField
+from .utils import get_recipes_limit
 from recipes.models import Ingredient, IngredientRecipe, Recipe, Tag
 from users.models import UserSubscriptions
 
 User = get_user_model()
 
+INGREDIENTS_BATCH_SIZE = 500
+
+# The same error the related fields used to report for unknown ids
+DOES_NOT_EXIST_MESSAGE = (
+    serializers.PrimaryKeyRelatedField.default_error_messages['does_not_exist']
+)
+
 
 class ShortRecipeSerializer(serializers.ModelSerializer):
     """Handles serialization of recipes data."""
@@ -53,6 +68,15 @@ class UserSerializer(serializers.ModelSerializer):
         }
 
     def get_is_subscribed(self, user) -> bool:
+        # Prefer the value annotated by the view queryset
+        if hasattr(user, 'is_subscribed'):
+            return user.is_subscribed
+
+        # Then the ids of subscribed users collected once per request
+        subscribed_ids = self.context.get('subscribed_ids')
+        if subscribed_ids is not None:
+            return user.pk in subscribed_ids
+
         request = self.context.get('request')
         return bool(
             request
@@ -63,35 +87,47 @@ class UserSerializer(serializers.ModelSerializer):
         )
 
     def get_avatar(self, user):
-        return user.avatar.url if user.avatar else None
+        avatar = user.avatar
+        return avatar.url if avatar.name else None
 
 
 class UserSubscriptionsSerializer(UserSerializer):
     """Serializes user subscription details."""
 
-    recipes_count = serializers.IntegerField(default=0, read_only=True)
+    recipes_count = serializers.SerializerMethodField()
     recipes = serializers.SerializerMethodField()
 
     class Meta(UserSerializer.Meta):
         fields = UserSerializer.Meta.fields + ('recipes_count', 'recipes')
 
-    def get_recipes(self, user: Recipe):
-        request = self.context.get('request')
-
-        if recipes_limit := (
-            request.query_params.get('recipes_limit') if request else None
-        ):
-            try:
-                recipes_limit = int(recipes_limit)
-            except ValueError:
-                recipes_limit = None
-
-        queryset = user.authored_recipes.all()  # type: ignore
-        recipes = queryset[:recipes_limit] if recipes_limit else queryset
+    def get_recipes_count(self, user) -> int:
+        # Prefer the value annotated by the subscriptions queryset
+        if hasattr(user, 'recipes_count'):
+            return user.recipes_count
+        return user.authored_recipes.count()
+
+    @cached_property
+    def recipes_limit(self) -> Optional[int]:
+        return get_recipes_limit(self.context.get('request'))
+
+    def get_recipes(self, user):
+        # Use recipes prefetched by the subscriptions queryset if present
+        recipes = getattr(user, 'prefetched_recipes', None)
+        if recipes is None:
+            recipes = user.authored_recipes.only(  # type: ignore
+                'author', *ShortRecipeSerializer.Meta.fields
+            )
+        if self.recipes_limit:
+            recipes = recipes[: self.recipes_limit]
         return ShortRecipeSerializer(recipes, many=True).data
 
     def to_representation(self, instance):
-        return super().to_representation(instance.subscribed_to)
+        user = instance.subscribed_to
+        if hasattr(instance, 'recipes_count'):
+            user.recipes_count = instance.recipes_count
+        if hasattr(instance, 'is_subscribed'):
+            user.is_subscribed = instance.is_subscribed
+        return super().to_representation(user)
 
 
 class UserSubscribeSerializer(serializers.ModelSerializer):
@@ -100,20 +136,27 @@ class UserSubscribeSerializer(serializers.ModelSerializer):
     class Meta:
         model = UserSubscriptions
         fields = ('subscriber', 'subscribed_to')
-        validators = (
-            validators.UniqueTogetherValidator(
-                queryset=UserSubscriptions.objects.all(),
-                fields=('subscriber', 'subscribed_to'),
-                message=_('You have already subscribed this user.'),
-            ),
-        )
+        read_only_fields = fields
+        # Uniqueness is enforced by the database constraint on insert
+        validators = ()
 
-    def validate(self, attrs):
-        if attrs['subscriber'] == attrs['subscribed_to']:
+    def create(self, validated_data) -> UserSubscriptions:
+        if validated_data['subscriber'] == validated_data['subscribed_to']:
             raise serializers.ValidationError(
-                {'detail': "You can't subscribe to yourself."}
+                {'detail': ["You can't subscribe to yourself."]}
+            )
+
+        try:
+            with atomic():
+                return super().create(validated_data)
+        except IntegrityError:
+            raise serializers.ValidationError(
+                {
+                    api_settings.NON_FIELD_ERRORS_KEY: [
+                        _('You have already subscribed this user.')
+                    ]
+                }
             )
-        return super().validate(attrs)
 
     def to_representation(self, instance):
         return UserSubscriptionsSerializer(instance, context=self.context).data
@@ -148,7 +191,7 @@ class IngredientListSerializer(serializers.ModelSerializer):
 class IngredientSerializer(serializers.ModelSerializer):
     """Provides serialized representation of ingredients with usage amounts."""
 
-    id = serializers.PrimaryKeyRelatedField(queryset=Ingredient.objects.all())
+    id = serializers.IntegerField()
     name = serializers.ReadOnlyField(source='ingredient.name')
     measurement_unit = serializers.ReadOnlyField(
         source='ingredient.measurement_unit'
@@ -163,16 +206,25 @@ class IngredientSerializer(serializers.ModelSerializer):
 class RecipeListSerializer(serializers.ModelSerializer):
     tags = TagSerializer(many=True)
     author = UserSerializer(read_only=True)
-    ingredients = IngredientSerializer(
-        many=True, source='ingredients_in_recipe'
-    )
+    ingredients = serializers.SerializerMethodField()
     image = Base64ImageField(required=True)
-    is_favorited = serializers.BooleanField(default=False)
-    is_in_shopping_cart = serializers.BooleanField(default=False)
+    is_favorited = serializers.BooleanField(read_only=True, default=False)
+    is_in_shopping_cart = serializers.BooleanField(
+        read_only=True, default=False
+    )
 
     class Meta:
         model = Recipe
-        exclude = ('short_link', 'publication_date')
+        exclude = ('short_link', 'publication_date', 'favorites_counter')
+
+    def get_ingredients(self, recipe) -> list[dict]:
+        # Prefer plain rows attached for list pages
+        ingredient_rows = getattr(recipe, 'ingredient_rows', None)
+        if ingredient_rows is not None:
+            return ingredient_rows
+        return IngredientSerializer(
+            recipe.ingredients_in_recipe.all(), many=True
+        ).data
 
 
 class RecipeSerializer(serializers.ModelSerializer):
@@ -180,8 +232,8 @@ class RecipeSerializer(serializers.ModelSerializer):
     Serializes recipes, including their tags, ingredients, and other details.
     """
 
-    tags = serializers.PrimaryKeyRelatedField(
-        many=True, required=True, queryset=Tag.objects.all()
+    tags = serializers.ListField(
+        child=serializers.IntegerField(), required=True
     )
     author = UserSerializer(read_only=True)
     ingredients = IngredientSerializer(many=True, required=True)
@@ -189,7 +241,62 @@ class RecipeSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Recipe
-        exclude = ('short_link',)
+        exclude = ('short_link', 'favorites_counter')
+
+    @classmethod
+    def setup_eager_loading(
+        cls, queryset: QuerySet, with_ingredients: bool = True
+    ) -> QuerySet:
+        """Load related objects rendered by the serializer up front."""
+        queryset = queryset.select_related('author').prefetch_related('tags')
+        if with_ingredients:
+            queryset = queryset.prefetch_related(
+                Prefetch(
+                    'ingredients_in_recipe',
+                    queryset=IngredientRecipe.objects.select_related(
+                        'ingredient'
+                    )
+                    .only(
+                        'recipe',
+                        'amount',
+                        'ingredient__name',
+                        'ingredient__measurement_unit',
+                    )
+                    .order_by('ingredient__name'),
+                )
+            )
+        return queryset
+
+    @staticmethod
+    def attach_ingredient_rows(recipes) -> None:
+        """
+        Attach ingredients of all recipes as plain dicts fetched
+        with a single values_list() query, without building model instances.
+        """
+        recipes_by_id = {recipe.pk: recipe for recipe in recipes}
+        for recipe in recipes_by_id.values():
+            recipe.ingredient_rows = []
+
+        ingredient_rows = (
+            IngredientRecipe.objects.filter(recipe_id__in=recipes_by_id)
+            .values_list(
+                'recipe_id',
+                'id',
+                'ingredient__name',
+                'ingredient__measurement_unit',
+                'amount',
+            )
+            .order_by('ingredient__name')
+        )
+        for recipe_id, pk, name, measurement_unit, amount in ingredient_rows:
+            recipes_by_id[recipe_id].ingredient_rows.append(
+                {
+                    'id': pk,
+                    'name': name,
+                    'measurement_unit': measurement_unit,
+                    'amount': amount,
+                }
+            )
 
     def validate(self, data):
         self._validate_tags(data.get('tags'))
@@ -206,24 +313,58 @@ class RecipeSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError(
                 {'tags': 'At least one tag is required.'}
             )
-        if len(tags) != len(set(tags)):
+        tag_ids = set(tags)
+        if len(tags) != len(tag_ids):
             raise serializers.ValidationError({'tags': 'Tags must be unique.'})
 
+        # Check all tags with a single query
+        existing_tag_ids = set(
+            Tag.objects.filter(pk__in=tag_ids).values_list('pk', flat=True)
+        )
+        for tag_id in tags:
+            if tag_id not in existing_tag_ids:
+                raise serializers.ValidationError(
+                    {'tags': [DOES_NOT_EXIST_MESSAGE.format(pk_value=tag_id)]},
+                    code='does_not_exist',
+                )
+
     def _validate_ingredients(self, ingredients_data):
         if not ingredients_data:
             raise serializers.ValidationError(
                 {'ingredients': 'Ingredients must be a non-empty list.'}
             )
 
-        validated_ingredients_ids = set()
-        for ingredient_data in ingredients_data:
-            ingredient_id = ingredient_data.get('id')
+        validated_ingredients_ids = {
+            ingredient_data['id'] for ingredient_data in ingredients_data
+        }
+        if len(validated_ingredients_ids) != len(ingredients_data):
+            raise serializers.ValidationError(
+                {'ingredients': 'Ingredients must be unique.'}
+            )
 
-            if ingredient_id in validated_ingredients_ids:
-                raise serializers.ValidationError(
-                    {'ingredients': 'Ingredients must be unique.'}
-                )
-            validated_ingredients_ids.add(ingredient_id)
+        # Resolve all ingredients with a single query
+        ingredients = Ingredient.objects.in_bulk(validated_ingredients_ids)
+        if len(ingredients) != len(validated_ingredients_ids):
+            # Errors are reported per item, as the related field did
+            raise serializers.ValidationError(
+                {
+                    'ingredients': [
+                        {}
+                        if ingredient_data['id'] in ingredients
+                        else {
+                            'id': [
+                                DOES_NOT_EXIST_MESSAGE.format(
+                                    pk_value=ingredient_data['id']
+                                )
+                            ]
+                        }
+                        for ingredient_data in ingredients_data
+                    ]
+                },
+                code='does_not_exist',
+            )
+        for ingredient_data in ingredients_data:
+            ingredient_data['id'] = ingredients[ingredient_data['id']]
 
     @atomic
     def create(self, validated_data) -> Recipe:
@@ -234,6 +375,7 @@ class RecipeSerializer(serializers.ModelSerializer):
         instance = Recipe.objects.create(author=author, **validated_data)
         instance.tags.set(tags_data)
         RecipeSerializer._create_ingredients(instance, ingredients_data)
+        RecipeSerializer.attach_ingredient_rows((instance,))
         return instance
 
     @atomic
@@ -242,23 +384,31 @@ class RecipeSerializer(serializers.ModelSerializer):
         instance.tags.set(tags_data)
 
         ingredients_data = validated_data.pop('ingredients', [])
-        instance.ingredients.clear()
+        IngredientRecipe.objects.filter(recipe=instance).delete()
         RecipeSerializer._create_ingredients(instance, ingredients_data)
+        # Render the new ingredients without a query per ingredient
+        RecipeSerializer.attach_ingredient_rows((instance,))
 
         return super().update(instance, validated_data)
 
     @staticmethod
     def _create_ingredients(recipe, ingredients) -> None:
         IngredientRecipe.objects.bulk_create(
-            [
+            (
                 IngredientRecipe(
                     recipe=recipe,
                     ingredient=item['id'],
                     amount=item['amount'],
                 )
                 for item in ingredients
-            ]
+            ),
+            batch_size=INGREDIENTS_BATCH_SIZE,
         )
 
     def to_representation(self, instance):
-        return RecipeListSerializer(instance).data
+        # Only the subscribed ids are forwarded, without the request,
+        # so image URLs stay relative
+        return RecipeListSerializer(
+            instance,
+            context={'subscribed_ids': self.context.get('subscribed_ids')},
+        ).data
@@ -1,15 +1,73 @@
+import binascii
+from typing import Optional
+
 from rest_framework.request import Request
 
 from recipes.models import Recipe
 
+try:
+    import pybase64
+except ImportError:  # pragma: no cover
+    pybase64 = None
+
+
+def get_base_url(request: Request) -> str:
+    """Return the request's scheme and host, built once per request."""
+
+    http_request = getattr(request, '_request', request)
+    base_url = getattr(http_request, 'base_url', None)
+    if base_url is None:
+        base_url = f'{request.scheme}://{request.get_host()}'
+        http_request.base_url = base_url
+    return base_url
+
+
+def get_short_link(recipe_pk) -> Optional[str]:
+    """Return the short link of a recipe, reading only that column."""
+
+    return (
+        Recipe.objects.filter(pk=recipe_pk)
+        .values_list('short_link', flat=True)
+        .first()
+    )
+
+
+def get_short_link_target(short_link: str) -> Optional[int]:
+    """Return the primary key of the recipe behind a short link."""
 
-def get_short_recipe_url(request: Request, recipe: Recipe) -> str:
+    return (
+        Recipe.objects.filter(short_link=short_link)
+        .values_list('pk', flat=True)
+        .first()
+    )
+
+
+def get_short_recipe_url(request: Request, short_link: str) -> str:
     """Generate a short URL for a recipe."""
 
-    return request.build_absolute_uri(f'/s/{recipe.short_link}')
+    return f'{get_base_url(request)}/s/{short_link}'
 
 
-def get_full_recipe_url(request: Request, recipe: Recipe) -> str:
+def get_full_recipe_url(request: Request, recipe_pk: int) -> str:
     """Generate the full URL for a recipe."""
 
-    return request.build_absolute_uri(f'/recipes/{recipe.id}')  # type: ignore
+    return f'{get_base_url(request)}/recipes/{recipe_pk}'
+
+
+def get_recipes_limit(request: Optional[Request]) -> Optional[int]:
+    """Parse the recipes_limit query parameter, if it is valid."""
+
+    recipes_limit = (
+        request.query_params.get('recipes_limit', '') if request else ''
+    )
+    return int(recipes_limit) if recipes_limit.isdigit() else None
+
+
+def decode_base64(data: str) -> bytes:
+    """Decode base64 data, using the SIMD-backed pybase64 if installed."""
+
+    if pybase64 is not None:
+        return pybase64.b64decode(data, validate=False)
+    # binascii accepts ASCII str directly, skipping the bytes copy
+    # base64.b64decode makes before calling it
+    return binascii.a2b_base64(data)
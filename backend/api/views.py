@@ -1,10 +1,20 @@
-from pathlib import Path
+from typing import Union
 
-from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.db.models import Count
+from django.db import IntegrityError
+from django.db.models import (
+    Count,
+    Exists,
+    IntegerField,
+    OuterRef,
+    Prefetch,
+    Subquery,
+    Value,
+)
+from django.db.models.functions import Coalesce
 from django.db.models.query import QuerySet
-from django.http import FileResponse
+from django.db.transaction import atomic
+from django.http import FileResponse, Http404
 from django.shortcuts import get_object_or_404
 from djoser.views import UserViewSet as DjoserUserViewSet
 from rest_framework import status, viewsets
@@ -17,12 +27,13 @@ from rest_framework.request import Request
 from rest_framework.response import Response
 
 from .filters import IngredientFilter, RecipeFilter
-from .mixins import ShoppingListGeneratorMixin
+from .mixins import ShoppingListGeneratorMixin, ValuesListMixin
 from .pagination import DefaultPagination
-from .utils import get_short_recipe_url
+from .utils import get_recipes_limit, get_short_link, get_short_recipe_url
 from api.permissions import IsAuthorOrReadOnly
 from api.serializers import (
     IngredientListSerializer,
+    RecipeListSerializer,
     RecipeSerializer,
     ShortRecipeSerializer,
     TagSerializer,
@@ -40,10 +51,29 @@ class UserViewset(DjoserUserViewSet):
     """Handles user profile management."""
 
     pagination_class = DefaultPagination
+    permission_overrides = {
+        'me': (IsAuthenticated,),
+        'avatar': (IsAuthenticated,),
+        'delete_avatar': (IsAuthenticated,),
+    }
+
+    def get_queryset(self) -> QuerySet:
+        queryset = super().get_queryset()
+        user = self.request.user
+        if user.is_authenticated:
+            queryset = queryset.annotate(
+                is_subscribed=Exists(
+                    UserSubscriptions.objects.filter(
+                        subscriber=user, subscribed_to=OuterRef('pk')
+                    )
+                )
+            )
+        return queryset
 
     def get_permissions(self):
-        if 'me/' in self.request.path:
-            self.permission_classes = (IsAuthenticated,)
+        permission_classes = self.permission_overrides.get(self.action)
+        if permission_classes is not None:
+            self.permission_classes = permission_classes
         return super().get_permissions()
 
     @action(
@@ -61,21 +91,19 @@ class UserViewset(DjoserUserViewSet):
 
     @avatar.mapping.delete
     def delete_avatar(self, request: Request) -> Response:
-        self._clear_avatar_field(request.user.id)
-        request.user.avatar.delete()  # type: ignore
+        user = request.user
+        avatar = user.avatar  # type: ignore
+        if avatar:
+            # Only the stored file is removed, and only the avatar
+            # column is written back
+            avatar.storage.delete(avatar.name)
+            user.avatar = None  # type: ignore
+            user.save(update_fields=('avatar',))
         return Response(
             {'detail': 'Avatar was deleted'},
             status=status.HTTP_204_NO_CONTENT,
         )
 
-    @staticmethod
-    def _clear_avatar_field(user_id) -> None:
-        avatars_folder_path = Path(settings.MEDIA_ROOT) / 'avatars'
-        if avatars_folder_path.exists():
-            avatar_path = avatars_folder_path / str(user_id)
-            if avatar_path.is_file():
-                avatar_path.unlink()
-
     @action(
         detail=True,
         methods=('POST',),
@@ -84,20 +112,24 @@ class UserViewset(DjoserUserViewSet):
     )
     def subscriptions(self, request: Request, id: int) -> Response:
         """Subscribe the authenticated user to another user."""
-        subscribed_to_user = get_object_or_404(User, pk=id)
-
-        recipes_count = (
-            subscribed_to_user.authored_recipes.count()  # type: ignore
+        # The existence check and the recipes count share one query
+        subscribed_to_user = get_object_or_404(
+            User.objects.annotate(recipes_count=Count('authored_recipes')),
+            pk=id,
         )
+
+        # Both users are already loaded, so they are passed to save()
+        # instead of being looked up again by primary key
         serializer = UserSubscribeSerializer(
-            data={
-                'subscriber': request.user.pk,
-                'subscribed_to': subscribed_to_user.pk,
-            },
-            context={'request': request, 'recipes_count': recipes_count},
+            data={}, context={'request': request}
         )
         serializer.is_valid(raise_exception=True)
-        serializer.save()
+        serializer.save(
+            subscriber=request.user, subscribed_to=subscribed_to_user
+        )
+
+        # The annotated instance is rendered and is now subscribed to
+        subscribed_to_user.is_subscribed = True
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
     @action(
@@ -108,22 +140,54 @@ class UserViewset(DjoserUserViewSet):
     )
     def get_subscriptions(self, request: Request):
         user = self.request.user
-        queryset = user.subscriptions.annotate(  # type: ignore
-            recipes_count=Count('subscribed_to__authored_recipes')
-        ).order_by('-recipes_count', 'subscribed_to__username')
+        recipes = Recipe.objects.only(
+            'author', *ShortRecipeSerializer.Meta.fields
+        )
+        recipes_limit = get_recipes_limit(request)
+        if recipes_limit:
+            # Limit recipes per author in the database
+            recipes = recipes[:recipes_limit]
+        queryset = (
+            user.subscriptions.annotate(  # type: ignore
+                # A correlated subquery avoids GROUP BY over the join
+                recipes_count=Coalesce(
+                    Subquery(
+                        Recipe.objects.filter(
+                            author_id=OuterRef('subscribed_to_id')
+                        )
+                        .order_by()
+                        .values('author_id')
+                        .annotate(count=Count('*'))
+                        .values('count')[:1],
+                        output_field=IntegerField(),
+                    ),
+                    0,
+                ),
+                is_subscribed=Value(True),
+            )
+            .select_related('subscribed_to')
+            .prefetch_related(
+                Prefetch(
+                    'subscribed_to__authored_recipes',
+                    queryset=recipes,
+                    to_attr='prefetched_recipes',
+                )
+            )
+            .order_by('-recipes_count', 'subscribed_to__username')
+        )
         page = self.paginate_queryset(queryset)
         serializer = self.get_serializer(page, many=True)
         return self.get_paginated_response(serializer.data)
 
     @subscriptions.mapping.delete
     def delete_subscription(self, request: Request, id: int) -> Response:
-        subscribed_to_user = get_object_or_404(User, pk=id)
-
         deleted_rows, _ = UserSubscriptions.objects.filter(
-            subscriber=request.user, subscribed_to=subscribed_to_user
+            subscriber=request.user, subscribed_to_id=id
         ).delete()
 
         if not deleted_rows:
+            # The user lookup only runs on the error path
+            get_object_or_404(User, pk=id)
             return Response(
                 {'detail': 'You are not subscribed to this user.'},
                 status=status.HTTP_400_BAD_REQUEST,
@@ -134,18 +198,20 @@ class UserViewset(DjoserUserViewSet):
         )
 
 
-class TagViewset(viewsets.ReadOnlyModelViewSet):
+class TagViewset(ValuesListMixin, viewsets.ReadOnlyModelViewSet):
     """Provides read-only access to tags."""
 
+    list_fields = TagSerializer.Meta.fields
     queryset = Tag.objects.all()
     serializer_class = TagSerializer
     pagination_class = None
     filterset_fields = ('name', 'slug')
 
 
-class IngredientsViewset(viewsets.ReadOnlyModelViewSet):
+class IngredientsViewset(ValuesListMixin, viewsets.ReadOnlyModelViewSet):
     """Provides read-only access to ingredients."""
 
+    list_fields = IngredientListSerializer.Meta.fields
     queryset = Ingredient.objects.all()
     serializer_class = IngredientListSerializer
     pagination_class = None
@@ -162,16 +228,50 @@ class RecipeViewset(ShoppingListGeneratorMixin, viewsets.ModelViewSet):
     http_method_names = ['get', 'post', 'patch', 'delete']
 
     def get_queryset(self) -> QuerySet:
-        return Recipe.objects.get_recipes_with_user_annotations(  # type: ignore # noqa: E501
-            self.request.user
+        if self.action == 'destroy':
+            # Nothing is rendered, only the author is checked
+            return Recipe.objects.all()
+
+        queryset = RecipeSerializer.setup_eager_loading(
+            Recipe.objects.get_recipes_with_user_annotations(  # type: ignore
+                self.request.user
+            ),
+            # List pages get ingredients attached in paginate_queryset
+            with_ingredients=self.action != 'list',
         )
+        if self.action in ('list', 'retrieve'):
+            # Read-only actions skip the columns that are never rendered
+            queryset = queryset.defer(*RecipeListSerializer.Meta.exclude)
+        return queryset
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        if page is not None:
+            RecipeSerializer.attach_ingredient_rows(page)
+        return page
+
+    def get_serializer_context(self) -> dict:
+        context = super().get_serializer_context()
+        user = self.request.user
+        if user.is_authenticated and (
+            self.get_serializer_class() is RecipeSerializer
+        ):
+            # Resolve is_subscribed for every nested author at once
+            context['subscribed_ids'] = set(
+                UserSubscriptions.objects.filter(
+                    subscriber=user
+                ).values_list('subscribed_to_id', flat=True)
+            )
+        return context
 
     @action(detail=True, url_path='get-link')
     def get_recipe_short_link(self, request: Request, pk: int) -> Response:
         """Generates a short link for a recipe."""
 
-        recipe = get_object_or_404(Recipe, pk=pk)
-        full_short_link = get_short_recipe_url(request, recipe)
+        short_link = get_short_link(pk)
+        if short_link is None:
+            raise Http404
+        full_short_link = get_short_recipe_url(request, short_link)
         return Response({'short-link': full_short_link})
 
     @action(
@@ -190,25 +290,13 @@ class RecipeViewset(ShoppingListGeneratorMixin, viewsets.ModelViewSet):
         serializer_class=ShortRecipeSerializer,
     )
     def shopping_cart(self, request: Request, pk: int) -> Response:
-        recipe = get_object_or_404(Recipe, pk=pk)
-
-        _, created = ShoppingCart.objects.get_or_create(
-            user=request.user, recipe=recipe
+        return self._add_item(
+            request=request,
+            pk=pk,
+            model=ShoppingCart,
+            error_message='You are already have this recipe in shopping cart.',
         )
 
-        if not created:
-            return Response(
-                {
-                    'detail': (
-                        'You are already have this recipe in shopping cart.'
-                    )
-                },
-                status=status.HTTP_400_BAD_REQUEST,
-            )
-
-        serializer = self.get_serializer(recipe)
-        return Response(serializer.data, status=status.HTTP_201_CREATED)
-
     @shopping_cart.mapping.delete
     def delete_from_shopping_cart(self, request: Request, pk: int) -> Response:
         return self._delete_item(
@@ -223,35 +311,55 @@ class RecipeViewset(ShoppingListGeneratorMixin, viewsets.ModelViewSet):
         serializer_class=ShortRecipeSerializer,
     )
     def favorites(self, request: Request, pk: int) -> Response:
-        recipe = get_object_or_404(Recipe, pk=pk)
-        _, created = Favorite.objects.get_or_create(
-            user=request.user, recipe=recipe
+        return self._add_item(
+            request=request,
+            pk=pk,
+            model=Favorite,
+            error_message='You are already have this recipe in favorite.',
+        )
+
+    @favorites.mapping.delete
+    def delete_favorite(self, request: Request, pk: int) -> Response:
+        return self._delete_item(
+            request=request, pk=pk, related_name='favorites'
         )
 
-        if not created:
+    def _add_item(
+        self,
+        request: Request,
+        pk: int,
+        model: type[Union[Favorite, ShoppingCart]],
+        error_message: str,
+    ) -> Response:
+        recipe = get_object_or_404(
+            Recipe.objects.only(*ShortRecipeSerializer.Meta.fields), pk=pk
+        )
+
+        # Insert straight away and let the unique constraint reject
+        # duplicates instead of looking the row up first
+        try:
+            with atomic():
+                model.objects.create(user=request.user, recipe=recipe)
+        except IntegrityError:
             return Response(
-                {'detail': ('You are already have this recipe in favorite.')},
+                {'detail': error_message},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
         serializer = self.get_serializer(recipe)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
-    @favorites.mapping.delete
-    def delete_favorite(self, request: Request, pk: int) -> Response:
-        return self._delete_item(
-            request=request, pk=pk, related_name='favorites'
-        )
-
     def _delete_item(
         self, request: Request, pk: int, related_name: str
     ) -> Response:
-        recipe = get_object_or_404(Recipe, pk=pk)
-        related_model = getattr(request.user, related_name)
-
-        deleted_rows, _ = related_model.filter(recipe=recipe).delete()
+        # Rows are removed by recipe id without fetching the recipe
+        deleted_rows, _ = (
+            getattr(request.user, related_name).filter(recipe_id=pk).delete()
+        )
 
         if not deleted_rows:
+            # The recipe lookup only runs on the error path
+            get_object_or_404(Recipe.objects.only('pk'), pk=pk)
             return Response(
                 {'detail': "You don't have this recipe in your favorites."},
                 status=status.HTTP_400_BAD_REQUEST,
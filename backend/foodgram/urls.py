@@ -5,8 +5,8 @@ from django.contrib import admin
 from django.urls import include, path
 
 urlpatterns = [
-    path('', include('recipes.urls')),
     path('api/', include('api.urls')),
+    path('', include('recipes.urls')),
     path('admin/', admin.site.urls),
 ]
 
@@ -1,6 +1,10 @@
 from django.contrib import admin
-from django.db.models import Count
+from django.contrib.admin.views.main import ChangeList
+from django.contrib.auth import get_user_model
+from django.db.models import Count, Exists, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
 from django.db.models.query import QuerySet
+from django.utils.text import smart_split, unescape_string_literal
 from rest_framework.request import Request
 
 from recipes.models import (
@@ -12,6 +16,28 @@ from recipes.models import (
     Tag,
 )
 
+User = get_user_model()
+
+
+def count_related(model, field_name: str) -> Coalesce:
+    """
+    Count rows of the model pointing to the outer object.
+
+    A correlated subquery keeps the changelist queryset free of
+    GROUP BY, so the paginator runs a plain COUNT(*).
+    """
+    return Coalesce(
+        Subquery(
+            model.objects.filter(**{field_name: OuterRef('pk')})
+            .order_by()
+            .values(field_name)
+            .annotate(count=Count('pk'))
+            .values('count'),
+            output_field=IntegerField(),
+        ),
+        0,
+    )
+
 
 @admin.register(Tag)
 class TagAdmin(admin.ModelAdmin):
@@ -31,7 +57,7 @@ class IngredientAdmin(admin.ModelAdmin):
         'measurement_unit',
         'recipes_with_ingredient_count',
     )
-    search_fields = ('name', 'measurement_unit')
+    search_fields = ('name',)
     list_filter = ('measurement_unit',)
     readonly_fields = ('recipes_with_ingredient_count',)
 
@@ -42,12 +68,35 @@ class IngredientAdmin(admin.ModelAdmin):
     def get_queryset(self, request: Request) -> QuerySet:
         queryset = super().get_queryset(request)
         return queryset.annotate(
-            annotated_recipes_count=Count('recipes_using_ingredient')
+            annotated_recipes_count=count_related(
+                IngredientRecipe, 'ingredient'
+            )
         )
 
 
 class IngredientsInline(admin.TabularInline):
     model = Recipe.ingredients.through
+    # Avoid rendering every ingredient as a <select> option per row
+    autocomplete_fields = ('ingredient',)
+
+    def get_queryset(self, request: Request) -> QuerySet:
+        queryset = super().get_queryset(request)
+        return queryset.select_related('ingredient', 'recipe').order_by(
+            'ingredient__name'
+        )
+
+
+class RecipeChangeList(ChangeList):
+    """
+    Recipe changelist that skips the columns it never displays,
+    such as the recipe text and image.
+    """
+
+    def get_queryset(self, request: Request) -> QuerySet:
+        queryset = super().get_queryset(request)
+        return queryset.only(
+            'name', 'short_link', 'author', 'favorites_counter'
+        )
 
 
 @admin.register(Recipe)
@@ -56,18 +105,49 @@ class RecipieAdmin(admin.ModelAdmin):
 
     inlines = (IngredientsInline,)
 
-    list_display = ('id', 'name', 'author', 'favorites_count', 'short_link')
-    search_fields = ('name', 'tags', 'author', 'short_link')
+    list_display = (
+        'id',
+        'name',
+        'author',
+        'favorites_counter',
+        'short_link',
+    )
+    list_select_related = ('author',)
+    search_fields = ('name', 'short_link')
     list_filter = ('tags', 'author', 'publication_date')
-    readonly_fields = ('favorites_count', 'short_link')
-
-    @admin.display(description='Число добавлений в избранное')
-    def favorites_count(self, obj):
-        return obj.favorites_count
-
-    def get_queryset(self, request: Request) -> QuerySet:
-        queryset = super().get_queryset(request)
-        return queryset.annotate(favorites_count=Count('favorites'))
+    readonly_fields = ('favorites_counter', 'short_link')
+
+    def get_search_results(self, request, queryset, search_term):
+        """
+        Match every term against the scalar search fields, tag names
+        and the author's username.
+
+        Tags and authors are checked with EXISTS subqueries, so the
+        query gains no JOINs however many terms are searched.
+        """
+        for term in smart_split(search_term):
+            if term.startswith(('"', "'")) and term[0] == term[-1]:
+                term = unescape_string_literal(term)
+            condition = Q(
+                Exists(
+                    Recipe.tags.through.objects.filter(
+                        recipe=OuterRef('pk'), tag__name__icontains=term
+                    )
+                )
+            ) | Q(
+                Exists(
+                    User.objects.filter(
+                        pk=OuterRef('author_id'), username__icontains=term
+                    )
+                )
+            )
+            for field_name in self.search_fields:
+                condition |= Q(**{f'{field_name}__icontains': term})
+            queryset = queryset.filter(condition)
+        return queryset, False
+
+    def get_changelist(self, request: Request, **kwargs):
+        return RecipeChangeList
 
 
 @admin.register(IngredientRecipe)
@@ -77,12 +157,19 @@ class IngredientRecipeAdmin(admin.ModelAdmin):
     list_display = ('id', 'recipe', 'ingredient', 'amount')
     search_fields = ('recipe__name', 'ingredient__name')
 
+    def get_queryset(self, request: Request) -> QuerySet:
+        # The default manager already joins the ingredient, and changelists
+        # ignore list_select_related once a queryset has select_related()
+        queryset = super().get_queryset(request)
+        return queryset.select_related('recipe')
+
 
 @admin.register(ShoppingCart)
 class ShoppingCartAdmin(admin.ModelAdmin):
     """Admin panel for the ShoppingCart model."""
 
     list_display = ('id', 'user', 'recipe')
+    list_select_related = ('user', 'recipe')
     search_fields = ('user__username', 'recipe__name')
 
 
@@ -91,4 +178,5 @@ class FavoriteAdmin(admin.ModelAdmin):
     """Admin panel for the Favorite model."""
 
     list_display = ('id', 'user', 'recipe')
+    list_select_related = ('user', 'recipe')
     search_fields = ('user__username', 'recipe__name')
@@ -1,3 +1,5 @@
+import string
+
 # Constraints
 MAX_DISPLAY_NAME_LENGTH = 50
 
@@ -8,6 +10,7 @@ MAX_MEASUREMENT_UNIT_NAME_LENGTH = 64
 MAX_RECIPE_NAME_LENGTH = 256
 
 MAX_LINK_LENGTH = 8
+SHORT_LINK_ALPHABET = string.ascii_letters + string.digits
 
 MIN_COOKING_TIME = 1
 MIN_AMOUNT = 1
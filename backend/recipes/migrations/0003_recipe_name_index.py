@@ -0,0 +1,44 @@
+# Generated by Django 4.2.16 on 2026-10-14 04:29
+
+from django.db import migrations, models
+
+# icontains lookups compile to UPPER("column"::text) LIKE UPPER(...),
+# so the trigram indexes are built over the same expression
+TRIGRAM_INDEXES = (
+    ('recipes_recipe_name_trgm', 'recipes_recipe'),
+    ('recipes_ingredient_name_trgm', 'recipes_ingredient'),
+)
+
+
+def create_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for index_name, table_name in TRIGRAM_INDEXES:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {index_name} ON {table_name} '
+            f'USING gin (UPPER("name"::text) gin_trgm_ops)'
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for index_name, _ in TRIGRAM_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {index_name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0002_alter_favorite_options_alter_shoppingcart_options_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='recipe',
+            name='name',
+            field=models.CharField(db_index=True, max_length=256, verbose_name='Название'),
+        ),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.16 on 2026-10-14 04:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0003_recipe_name_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='ingredientrecipe',
+            index=models.Index(fields=['recipe', 'ingredient'], name='ingredient_recipe_recipe_idx'),
+        ),
+    ]
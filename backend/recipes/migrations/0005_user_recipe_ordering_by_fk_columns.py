@@ -0,0 +1,21 @@
+# Generated by Django 4.2.16 on 2026-10-14 04:32
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0004_ingredientrecipe_recipe_index'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='favorite',
+            options={'default_related_name': 'favorites', 'ordering': ('user_id', 'recipe_id'), 'verbose_name': 'Избранное', 'verbose_name_plural': 'Избранное'},
+        ),
+        migrations.AlterModelOptions(
+            name='shoppingcart',
+            options={'default_related_name': 'shopping_cart', 'ordering': ('user_id', 'recipe_id'), 'verbose_name': 'Корзина', 'verbose_name_plural': 'Корзины'},
+        ),
+    ]
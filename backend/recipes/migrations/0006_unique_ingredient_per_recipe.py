@@ -0,0 +1,39 @@
+# Generated by Django 4.2.16 on 2026-10-14 04:33
+
+from django.db import migrations, models
+
+
+def remove_duplicate_ingredients(apps, schema_editor):
+    """Keep the first row of every (ingredient, recipe) pair."""
+    IngredientRecipe = apps.get_model('recipes', 'IngredientRecipe')
+    duplicates = (
+        IngredientRecipe.objects.order_by()
+        .values('ingredient', 'recipe')
+        .annotate(first_id=models.Min('id'), rows=models.Count('id'))
+        .filter(rows__gt=1)
+    )
+    for duplicate in duplicates:
+        IngredientRecipe.objects.filter(
+            ingredient=duplicate['ingredient'], recipe=duplicate['recipe']
+        ).exclude(id=duplicate['first_id']).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0005_user_recipe_ordering_by_fk_columns'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='ingredientrecipe',
+            name='unique_ingredient_recipe',
+        ),
+        migrations.RunPython(
+            remove_duplicate_ingredients, migrations.RunPython.noop
+        ),
+        migrations.AddConstraint(
+            model_name='ingredientrecipe',
+            constraint=models.UniqueConstraint(fields=('ingredient', 'recipe'), name='unique_ingredient_recipe'),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 4.2.16 on 2026-10-14 04:35
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def fill_favorites_counter(apps, schema_editor):
+    Favorite = apps.get_model('recipes', 'Favorite')
+    Recipe = apps.get_model('recipes', 'Recipe')
+    Recipe.objects.update(
+        favorites_counter=Coalesce(
+            models.Subquery(
+                Favorite.objects.filter(recipe=models.OuterRef('pk'))
+                .order_by()
+                .values('recipe')
+                .annotate(count=models.Count('pk'))
+                .values('count'),
+                output_field=models.PositiveIntegerField(),
+            ),
+            0,
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0006_unique_ingredient_per_recipe'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recipe',
+            name='favorites_counter',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Число добавлений в избранное'),
+        ),
+        migrations.RunPython(
+            fill_favorites_counter, migrations.RunPython.noop
+        ),
+    ]
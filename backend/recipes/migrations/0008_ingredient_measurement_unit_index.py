@@ -0,0 +1,18 @@
+# Generated by Django 4.2.16 on 2026-10-14 04:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0007_recipe_favorites_counter'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='ingredient',
+            name='measurement_unit',
+            field=models.CharField(db_index=True, max_length=64, verbose_name='Единицы измерения'),
+        ),
+    ]
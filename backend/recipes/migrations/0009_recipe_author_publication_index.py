@@ -0,0 +1,17 @@
+# Generated by Django 4.2.16 on 2026-10-14 04:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0008_ingredient_measurement_unit_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='recipe',
+            index=models.Index(fields=['author', '-publication_date'], name='recipe_author_pub_idx'),
+        ),
+    ]
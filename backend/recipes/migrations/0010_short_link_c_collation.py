@@ -0,0 +1,30 @@
+from django.db import migrations
+
+
+def use_c_collation(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        'ALTER TABLE recipes_recipe '
+        'ALTER COLUMN short_link TYPE varchar(8) COLLATE "C"'
+    )
+
+
+def use_default_collation(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        'ALTER TABLE recipes_recipe '
+        'ALTER COLUMN short_link TYPE varchar(8) COLLATE "default"'
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0009_recipe_author_publication_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(use_c_collation, use_default_collation),
+    ]
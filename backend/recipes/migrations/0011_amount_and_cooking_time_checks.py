@@ -0,0 +1,21 @@
+# Generated by Django 4.2.16 on 2026-10-14 04:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0010_short_link_c_collation'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='ingredientrecipe',
+            constraint=models.CheckConstraint(check=models.Q(('amount__gte', 1), ('amount__lte', 32767)), name='ingredient_recipe_amount_range'),
+        ),
+        migrations.AddConstraint(
+            model_name='recipe',
+            constraint=models.CheckConstraint(check=models.Q(('cooking_time__gte', 1), ('cooking_time__lte', 32767)), name='recipe_cooking_time_range'),
+        ),
+    ]
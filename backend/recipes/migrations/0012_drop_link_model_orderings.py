@@ -0,0 +1,25 @@
+# Generated by Django 4.2.16 on 2026-10-14 04:43
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0011_amount_and_cooking_time_checks'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='favorite',
+            options={'default_related_name': 'favorites', 'verbose_name': 'Избранное', 'verbose_name_plural': 'Избранное'},
+        ),
+        migrations.AlterModelOptions(
+            name='ingredientrecipe',
+            options={'verbose_name': 'Связь ингредиент–рецепт', 'verbose_name_plural': 'Связи ингредиент–рецепт'},
+        ),
+        migrations.AlterModelOptions(
+            name='shoppingcart',
+            options={'default_related_name': 'shopping_cart', 'verbose_name': 'Корзина', 'verbose_name_plural': 'Корзины'},
+        ),
+    ]
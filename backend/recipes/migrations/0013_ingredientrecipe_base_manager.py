@@ -0,0 +1,17 @@
+# Generated by Django 4.2.16 on 2026-10-14 04:44
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0012_drop_link_model_orderings'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='ingredientrecipe',
+            options={'base_manager_name': 'objects', 'verbose_name': 'Связь ингредиент–рецепт', 'verbose_name_plural': 'Связи ингредиент–рецепт'},
+        ),
+    ]
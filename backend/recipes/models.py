@@ -1,8 +1,9 @@
-import uuid
+import secrets
 
 from django.contrib.auth import get_user_model
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import IntegrityError, models
+from django.db.transaction import atomic
 
 from .constants import (
     MAX_AMOUNT,
@@ -17,6 +18,7 @@ from .constants import (
     MAX_TAG_SLUG_LENGTH,
     MIN_AMOUNT,
     MIN_COOKING_TIME,
+    SHORT_LINK_ALPHABET,
 )
 from .utils import get_recipe_media_path
 
@@ -54,6 +56,7 @@ class Ingredient(models.Model):
     measurement_unit = models.CharField(
         max_length=MAX_MEASUREMENT_UNIT_NAME_LENGTH,
         verbose_name='Единицы измерения',
+        db_index=True,
     )
 
     class Meta:
@@ -77,6 +80,13 @@ class Ingredient(models.Model):
         )
 
 
+class IngredientRecipeManager(models.Manager):
+    """Manager that joins the ingredient every row is displayed with."""
+
+    def get_queryset(self) -> models.QuerySet:
+        return super().get_queryset().select_related('ingredient')
+
+
 class IngredientRecipe(models.Model):
     """
     Model for the many-to-many relationship between recipes and ingredients.
@@ -102,14 +112,30 @@ class IngredientRecipe(models.Model):
         ),
     )
 
+    objects = IngredientRecipeManager()
+
     class Meta:
-        ordering = ('recipe', 'ingredient')
+        # Also used by the deletion collector and related lookups
+        base_manager_name = 'objects'
         verbose_name = 'Связь ингредиент–рецепт'
         verbose_name_plural = 'Связи ингредиент–рецепт'
         constraints = [
             models.UniqueConstraint(
-                fields=['ingredient', 'recipe', 'amount'],
+                fields=['ingredient', 'recipe'],
                 name='unique_ingredient_recipe',
+            ),
+            models.CheckConstraint(
+                check=models.Q(amount__gte=MIN_AMOUNT)
+                & models.Q(amount__lte=MAX_AMOUNT),
+                name='ingredient_recipe_amount_range',
+            ),
+        ]
+        # The unique constraint covers lookups by ingredient; this one
+        # serves loading a recipe's ingredients
+        indexes = [
+            models.Index(
+                fields=['recipe', 'ingredient'],
+                name='ingredient_recipe_recipe_idx',
             )
         ]
 
@@ -122,24 +148,34 @@ class IngredientRecipe(models.Model):
     def __repr__(self) -> str:
         return (
             f'<IngredientRecipe('
-            f'ingredient={self.ingredient.name!r}, '
-            f'recipe={self.recipe.name!r}, '
+            f'ingredient_id={self.ingredient_id!r}, '  # type: ignore
+            f'recipe_id={self.recipe_id!r}, '  # type: ignore
             f'amount={self.amount!r})>'
         )
 
 
 class RecipeQuerySet(models.QuerySet):
+    def update_favorites_counter(self, delta: int) -> int:
+        """Shift the stored favorites counter of the selected recipes."""
+        return self.update(
+            favorites_counter=models.F('favorites_counter') + delta
+        )
+
     def get_recipes_with_user_annotations(self, user):
-        if user.is_authenticated:
-            favorites_queryset = user.favorites.filter(  # type: ignore
-                recipe=models.OuterRef('pk')
+        if not user.is_authenticated:
+            # Anonymous users have neither favorites nor a shopping cart,
+            # so constants replace the subqueries
+            not_set = models.Value(False, output_field=models.BooleanField())
+            return Recipe.objects.annotate(
+                is_favorited=not_set, is_in_shopping_cart=not_set
             )
-            shopping_cart_queryset = user.shopping_cart.filter(  # type: ignore
-                recipe=models.OuterRef('pk')
-            )
-        else:
-            favorites_queryset = shopping_cart_queryset = User.objects.none()
 
+        favorites_queryset = user.favorites.filter(  # type: ignore
+            recipe=models.OuterRef('pk')
+        )
+        shopping_cart_queryset = user.shopping_cart.filter(  # type: ignore
+            recipe=models.OuterRef('pk')
+        )
         return Recipe.objects.annotate(
             is_favorited=models.Exists(favorites_queryset),
             is_in_shopping_cart=models.Exists(shopping_cart_queryset),
@@ -167,7 +203,9 @@ class Recipe(models.Model):
         related_name='recipes_with_ingredient',
     )
     name = models.CharField(
-        max_length=MAX_RECIPE_NAME_LENGTH, verbose_name='Название'
+        max_length=MAX_RECIPE_NAME_LENGTH,
+        verbose_name='Название',
+        db_index=True,
     )
     image = models.ImageField(
         upload_to=get_recipe_media_path,
@@ -186,11 +224,20 @@ class Recipe(models.Model):
     publication_date = models.DateTimeField(
         auto_now_add=True, verbose_name='Дата публикации'
     )
+    # Uses the byte-wise "C" collation on PostgreSQL (migration 0010),
+    # which must be reapplied if the column is ever altered
     short_link = models.CharField(
         max_length=MAX_LINK_LENGTH,
         unique=True,
         verbose_name='Короткая ссылка',
     )
+    # Kept in step with Favorite rows by recipes.signals,
+    # so listings read a column instead of counting favorites
+    favorites_counter = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Число добавлений в избранное',
+    )
 
     objects = RecipeQuerySet.as_manager()
 
@@ -198,19 +245,56 @@ class Recipe(models.Model):
         ordering = ('-publication_date',)
         verbose_name = 'Рецепт'
         verbose_name_plural = 'Рецепты'
+        constraints = [
+            models.CheckConstraint(
+                check=models.Q(cooking_time__gte=MIN_COOKING_TIME)
+                & models.Q(cooking_time__lte=MAX_COOKING_TIME),
+                name='recipe_cooking_time_range',
+            )
+        ]
+        # Serves author filters and per-author recipe previews
+        # in their default order
+        indexes = [
+            models.Index(
+                fields=['author', '-publication_date'],
+                name='recipe_author_pub_idx',
+            )
+        ]
 
-    def generate_short_link(self) -> str:
-        """Generate a unique short link using a UUID."""
-        for _ in range(MAX_GENERATION_ATTEMPTS):
-            short_link = str(uuid.uuid4())[:MAX_LINK_LENGTH]
-            if not Recipe.objects.filter(short_link=short_link).exists():
-                return short_link
-        raise ValueError('Could not generate a unique short link.')
+    @staticmethod
+    def generate_short_link() -> str:
+        """Generate a random base62 short link."""
+        return ''.join(
+            secrets.choice(SHORT_LINK_ALPHABET) for _ in range(MAX_LINK_LENGTH)
+        )
 
     def save(self, *args, **kwargs) -> None:
-        if not self.short_link:
+        if not self._state.adding and not args and not (
+            kwargs.get('force_insert') or 'update_fields' in kwargs
+        ):
+            # favorites_counter is only changed with F() updates by
+            # recipes.signals, so a loaded copy is never written back
+            kwargs['update_fields'] = {
+                field.attname
+                for field in self._meta.concrete_fields
+                if not field.primary_key
+            } - self.get_deferred_fields() - {'favorites_counter'}
+        if self.short_link:
+            return super().save(*args, **kwargs)
+        # The unique constraint detects collisions, so no lookup
+        # is made before the write
+        for _ in range(MAX_GENERATION_ATTEMPTS):
             self.short_link = self.generate_short_link()
-        return super().save(*args, **kwargs)
+            try:
+                with atomic():
+                    return super().save(*args, **kwargs)
+            except IntegrityError:
+                # Any other violation is reported as it is
+                if not Recipe.objects.filter(
+                    short_link=self.short_link
+                ).exists():
+                    raise
+        raise ValueError('Could not generate a unique short link.')
 
     def __str__(self) -> str:
         return self.name[:MAX_DISPLAY_NAME_LENGTH]
@@ -219,7 +303,7 @@ class Recipe(models.Model):
         return (
             f'<Recipe('
             f'name={self.name!r}, '
-            f'author={self.author.username!r})>'
+            f'author_id={self.author_id!r})>'  # type: ignore
         )
 
 
@@ -228,7 +312,6 @@ class UserRecipeBaseClass(models.Model):
 
     class Meta:
         abstract = True
-        ordering = ('user', 'recipe')
         constraints = (
             models.UniqueConstraint(
                 fields=('user', 'recipe'),
@@ -245,8 +328,8 @@ class UserRecipeBaseClass(models.Model):
     def __repr__(self) -> str:
         return (
             f'<{self.__class__.__name__}('
-            f'user={self.user.username!r}, '  # type: ignore
-            f'recipe={self.recipe.name!r})>'  # type: ignore
+            f'user_id={self.user_id!r}, '  # type: ignore
+            f'recipe_id={self.recipe_id!r})>'  # type: ignore
         )
 
 
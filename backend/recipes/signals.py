@@ -0,0 +1,16 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Favorite, Recipe
+
+
+@receiver(post_save, sender=Favorite)
+def increment_favorites_counter(instance, created, **kwargs) -> None:
+    if created:
+        recipes = Recipe.objects.filter(pk=instance.recipe_id)
+        recipes.update_favorites_counter(1)
+
+
+@receiver(post_delete, sender=Favorite)
+def decrement_favorites_counter(instance, **kwargs) -> None:
+    Recipe.objects.filter(pk=instance.recipe_id).update_favorites_counter(-1)
@@ -1,8 +1,8 @@
-from django.shortcuts import get_object_or_404, redirect
+from django.http import Http404
+from django.shortcuts import redirect
 from rest_framework.request import Request
 
-from .models import Recipe
-from api.utils import get_full_recipe_url
+from api.utils import get_full_recipe_url, get_short_link_target
 
 
 def redirect_short_url(request: Request, short_url: str):
@@ -10,6 +10,8 @@ def redirect_short_url(request: Request, short_url: str):
     Redirects a short URL to its corresponding full recipe URL.
     """
 
-    recipe = get_object_or_404(Recipe, short_link=short_url)
-    full_url = get_full_recipe_url(request, recipe)
+    recipe_pk = get_short_link_target(short_url)
+    if recipe_pk is None:
+        raise Http404
+    full_url = get_full_recipe_url(request, recipe_pk)
     return redirect(full_url)
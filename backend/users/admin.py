@@ -1,9 +1,11 @@
 from typing import Literal, Union
 
 from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
 from django.contrib.auth import get_user_model
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.contrib.auth.models import Group
+from django.db.models.query import QuerySet
 from django.utils.safestring import SafeText, mark_safe
 
 from users.models import UserSubscriptions
@@ -11,6 +13,19 @@ from users.models import UserSubscriptions
 User = get_user_model()
 
 
+class UserChangeList(ChangeList):
+    """
+    User changelist that skips the columns it never displays,
+    such as the password hash and login timestamps.
+    """
+
+    def get_queryset(self, request) -> QuerySet:
+        queryset = super().get_queryset(request)
+        return queryset.only(
+            'username', 'email', 'first_name', 'last_name', 'avatar'
+        )
+
+
 @admin.register(User)
 class UserAdmin(BaseUserAdmin):
     """
@@ -40,6 +55,9 @@ class UserAdmin(BaseUserAdmin):
 
     avatar_preview.short_description = 'Аватар'
 
+    def get_changelist(self, request, **kwargs):
+        return UserChangeList
+
 
 @admin.register(UserSubscriptions)
 class UserSubscriptionsAdmin(admin.ModelAdmin):
@@ -48,6 +66,9 @@ class UserSubscriptionsAdmin(admin.ModelAdmin):
     """
 
     list_display = ('subscriber', 'subscribed_to')
+    list_select_related = ('subscriber', 'subscribed_to')
+    # Avoid rendering every user as a <select> option per field
+    autocomplete_fields = ('subscriber', 'subscribed_to')
     search_fields = ('subscriber__username', 'subscribed_to__username')
 
 
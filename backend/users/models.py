@@ -87,6 +87,6 @@ class UserSubscriptions(models.Model):
     def __repr__(self) -> str:
         return (
             f'<UserSubscriptions('
-            f'subscriber={self.subscriber.username!r}, '
-            f'subscribed_to={self.subscribed_to.username!r})>'
+            f'subscriber_id={self.subscriber_id!r}, '  # type: ignore
+            f'subscribed_to_id={self.subscribed_to_id!r})>'  # type: ignore
         )
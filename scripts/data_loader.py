@@ -1,9 +1,11 @@
 import csv
+import io
 import os
 import sqlite3
+from itertools import chain
 from pathlib import Path
+from typing import Iterable, Iterator
 
-import psycopg2
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -21,8 +23,29 @@ pg_port = os.getenv('DB_PORT', '5432')
 pg_dbname = os.getenv('POSTGRES_DB', 'your_db')
 pg_user = os.getenv('POSTGRES_USER', 'your_user')
 pg_password = os.getenv('POSTGRES_PASSWORD', 'your_password')
+pg_connection_params = {
+    'host': pg_host,
+    'port': pg_port,
+    'dbname': pg_dbname,
+    'user': pg_user,
+    'password': pg_password,
+}
 db_type = os.getenv('DB_TYPE', 'sqlite')
 
+# Accept the backend's own DB_TYPE value as well as the full name
+use_postgres = db_type.lower() in ('postgres', 'postgresql')
+
+if use_postgres:
+    import psycopg2
+
+# Connection-local settings for the bulk load: no fsync per page,
+# temporary structures and a ~200 MB page cache kept in memory
+SQLITE_BULK_LOAD_PRAGMAS = (
+    'PRAGMA synchronous = OFF;'
+    'PRAGMA temp_store = MEMORY;'
+    'PRAGMA cache_size = -200000;'
+)
+
 
 def db_connection(func):
     """
@@ -31,19 +54,19 @@ def db_connection(func):
     """
 
     def wrapper(*args, **kwargs):
-        if db_type.lower() == 'postgresql':
-            connection = psycopg2.connect(
-                host=pg_host,
-                port=pg_port,
-                dbname=pg_dbname,
-                user=pg_user,
-                password=pg_password,
-            )
+        if use_postgres:
+            connection = psycopg2.connect(**pg_connection_params)
         else:  # Default to SQLite
             connection = sqlite3.connect(sqlite_db_path)
 
         cursor = connection.cursor()
         try:
+            # The whole load runs in one transaction committed below
+            if use_postgres:
+                cursor.execute('SET LOCAL synchronous_commit = OFF')
+            else:
+                cursor.executescript(SQLITE_BULK_LOAD_PRAGMAS)
+                cursor.execute('BEGIN IMMEDIATE')
             result = func(cursor=cursor, *args, **kwargs)
             connection.commit()
         except Exception as e:
@@ -56,41 +79,61 @@ def db_connection(func):
     return wrapper
 
 
-def read_csv(file_path: Path):
+def iter_csv_rows(file_path: Path) -> Iterator[tuple[str, str]]:
+    """
+    Yields CSV rows one by one with capitalized ingredient names.
+    """
+    with open(file_path, 'r', newline='') as file:
+        for name, measurement_unit in csv.reader(file):
+            yield name.capitalize(), measurement_unit
+
+
+def read_csv(file_path: Path) -> Iterator[tuple[str, str]]:
     """
-    Reads a CSV file and returns its content as a tuple of rows.
+    Returns a lazy iterator over the CSV rows,
+    checking up front that the file has any.
     """
-    with open(file_path, 'r') as file:
-        reader = csv.reader(file)
-        data = []
-        for row in reader:
-            row[0] = row[0].capitalize()
-            data.append(tuple(row))
-    if not data:
+    rows = iter_csv_rows(file_path)
+    first_row = next(rows, None)
+    if first_row is None:
         raise ValueError('CSV file is empty or not formatted correctly.')
-    return data
+    return chain((first_row,), rows)
 
 
 @db_connection
-def load_data(cursor, data: tuple):
+def load_data(cursor, data: Iterable[tuple[str, str]]):
     """
-    Loads data into the `recipes_ingredient` table.
+    Loads data into the `recipes_ingredient` table,
+    skipping ingredients that are already there.
     """
-    if not data:
-        raise ValueError('No data to insert.')
-
-    insert_query = (
-        (
-            'INSERT INTO recipes_ingredient '
-            '(name, measurement_unit) VALUES (%s, %s)'
+    if use_postgres:
+        # COPY sends every row in a single round-trip
+        # instead of one INSERT per row. COPY cannot skip conflicts,
+        # so rows go through a staging table first
+        buffer = io.StringIO()
+        csv.writer(buffer, lineterminator='\n').writerows(data)
+        buffer.seek(0)
+        cursor.execute(
+            'CREATE TEMPORARY TABLE ingredient_import '
+            '(name varchar, measurement_unit varchar) ON COMMIT DROP'
         )
-        if isinstance(cursor, psycopg2.extensions.cursor)
-        else (
-            'INSERT INTO recipes_ingredient '
-            '(name, measurement_unit) VALUES (?, ?)'
+        cursor.copy_expert(
+            'COPY ingredient_import (name, measurement_unit) '
+            'FROM STDIN WITH (FORMAT csv)',
+            buffer,
         )
+        cursor.execute(
+            'INSERT INTO recipes_ingredient (name, measurement_unit) '
+            'SELECT name, measurement_unit FROM ingredient_import '
+            'ON CONFLICT (name, measurement_unit) DO NOTHING'
+        )
+        return
+
+    cursor.executemany(
+        'INSERT OR IGNORE INTO recipes_ingredient '
+        '(name, measurement_unit) VALUES (?, ?)',
+        data,
     )
-    cursor.executemany(insert_query, data)
 
 
 if __name__ == '__main__':